@@ -30,6 +30,8 @@ class AudioPlayer:
         self.instance = instance
         self.player: Optional[vlc.MediaPlayer] = None
         self.current_file: Optional[str] = None
+        # Duration (s) of the current media as read by play(); 0.0 if unknown
+        self.duration = 0.0
         self._last_position = 0.0
         self._is_paused = False
 
@@ -37,6 +39,11 @@ class AudioPlayer:
         self._track_thread: Optional[threading.Thread] = None
         self._end_reached = threading.Event()
 
+        # Listening clock: monotonic start of the current stretch of
+        # playback (None while paused/stopped) and seconds not yet taken
+        self._listen_since: Optional[float] = None
+        self._listened = 0.0
+
     def _get_duration_internal(self, timeout=2.0) -> float:
         """Get media duration, waiting briefly for VLC to parse."""
         if not self.player:
@@ -61,6 +68,7 @@ class AudioPlayer:
     def play(self, file_path: str, start_position: float = 0.0):
         """Start playing audio file from position."""
         self.stop()
+        self._listened = 0.0  # callers take_listened() before switching
 
         if not Path(file_path).exists():
             log("ERROR", f"File not found: {file_path}")
@@ -86,7 +94,7 @@ class AudioPlayer:
             time.sleep(0.1)
 
             # Check if near end, restart if so
-            duration = self._get_duration_internal()
+            duration = self.duration = self._get_duration_internal()
             if duration > 0 and (duration - start_position) <= RESUME_END_THRESHOLD:
                 log(
                     "INFO",
@@ -97,6 +105,7 @@ class AudioPlayer:
 
             if start_position > 0:
                 self.seek(start_position)
+            self._listen_since = time.monotonic()
 
             # Start position tracking
             if self.position_callback:
@@ -112,6 +121,7 @@ class AudioPlayer:
 
     def _on_media_end(self, _event):
         """Called by VLC when media reaches end. Runs in VLC thread."""
+        self._stop_clock()
         self._end_reached.set()
 
     def has_ended(self) -> bool:
@@ -126,6 +136,7 @@ class AudioPlayer:
         if self.player and not self._is_paused:
             self.player.pause()
             self._is_paused = True
+            self._stop_clock()
             log("DEBUG", "VLC paused")
 
     def resume(self):
@@ -133,10 +144,30 @@ class AudioPlayer:
         if self.player and self._is_paused:
             self.player.pause()  # VLC toggles
             self._is_paused = False
+            self._listen_since = time.monotonic()
             log("DEBUG", "VLC resumed")
 
+    def _stop_clock(self):
+        """Bank the current stretch of playback into the listening clock."""
+        since = self._listen_since
+        if since is not None:
+            self._listen_since = None
+            self._listened += time.monotonic() - since
+
+    def take_listened(self) -> float:
+        """Seconds of actual playback since the last call (or play())."""
+        listened = self._listened
+        since = self._listen_since
+        if since is not None:
+            now = time.monotonic()
+            listened += now - since
+            self._listen_since = now
+        self._listened = 0.0
+        return listened
+
     def stop(self):
         """Stop playback and tracking thread."""
+        self._stop_clock()
         self._stop_tracking.set()
         self._end_reached.clear()
         if self._track_thread:
@@ -151,6 +182,7 @@ class AudioPlayer:
             self.player = None
 
         self.current_file = None
+        self.duration = 0.0
         self._is_paused = False
 
     def get_position(self) -> float:
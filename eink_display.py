@@ -150,7 +150,7 @@ class EinkDisplay:
                 except Exception:
                     continue
 
-        log("DEBUG", f"No TTF font found, using Pillow default (size={size})")
+        log("DEBUG", "No TTF font found, using Pillow default (size=%d)", size)
         return ImageFont.load_default()
 
     # --- Icon loading ------------------------------------------------------
@@ -169,13 +169,13 @@ class EinkDisplay:
 
         icons_path = Path(icons_dir)
         if not icons_path.is_dir():
-            log("DEBUG", f"Icons directory not found: {icons_dir}")
+            log("DEBUG", "Icons directory not found: %s", icons_dir)
             return
 
         for name in ("podcast", "music"):
             icon_file = icons_path / f"{name}.png"
             if not icon_file.exists():
-                log("DEBUG", f"Icon not found: {icon_file}")
+                log("DEBUG", "Icon not found: %s", icon_file)
                 continue
             try:
                 img = Image.open(icon_file).convert("1")
@@ -183,7 +183,7 @@ class EinkDisplay:
                     (self.ICON_SIZE, self.ICON_SIZE), Image.Resampling.NEAREST
                 )
                 self._icons[name] = img
-                log("DEBUG", f"Loaded icon: {name} ({self.ICON_SIZE}x{self.ICON_SIZE})")
+                log("DEBUG", "Loaded icon: %s (%dx%d)", name, self.ICON_SIZE, self.ICON_SIZE)
             except Exception as e:
                 log("WARNING", f"Failed to load icon {name}: {e}")
 
@@ -252,7 +252,7 @@ class EinkDisplay:
             self.epd.sleep()
             log("DEBUG", "Display entered sleep mode")
         except Exception as e:
-            log("DEBUG", f"Display cleanup: {e}")
+            log("DEBUG", "Display cleanup: %s", e)
 
     # --- Layout helpers ----------------------------------------------------
 
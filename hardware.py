@@ -1,5 +1,6 @@
 """GPIO hardware control for rotary switch and mode switch."""
 
+import threading
 import time
 from enum import Enum
 from typing import Optional, Tuple
@@ -27,9 +28,21 @@ POSITION_PINS = [4, 18, 22, 23, 9, 21, 5, 6, 12, 13, 16, 20]
 PIN_PLAY = 7
 PIN_MUSIC = 27
 
+# Mode by (play pin low << 1 | music pin low). Neither or both low (the
+# center position, or mid-throw) reads as paused.
+_MODE_TABLE = (
+    SwitchState.PAUSED,
+    SwitchState.MUSIC_MODE,
+    SwitchState.PLAYING,
+    SwitchState.PAUSED,
+)
+
 # Debounce settings
 STABLE_READS = 3
 DEBOUNCE_TIME = 0.2
+# The mode switch reads both pins HIGH for a moment mid-throw, which decodes
+# as PAUSED. Require this many agreeing reads before accepting a new mode.
+MODE_STABLE_READS = 2
 
 
 class HardwareController:
@@ -38,10 +51,18 @@ class HardwareController:
     def __init__(self):
         self.gpio_available = GPIO_AVAILABLE
         self.last_podcast_index = 1
+        self.last_mode = SwitchState.PAUSED
+        self._mode_sample = None
+        self._mode_stable_count = 0
         self._stable_count = 0
         self._last_sample = None
         self._last_confirm = None
         self._last_confirm_time = 0.0
+        # Set from the RPi.GPIO callback thread on any pin edge
+        self._edge = threading.Event()
+        self._edge_pending = True  # read at least once
+        self._reported = None
+        self.edge_detection = False
 
         if self.gpio_available:
             self._setup_gpio()
@@ -58,13 +79,82 @@ class HardwareController:
         except Exception as e:
             log("ERROR", f"GPIO init failed: {e}")
             self.gpio_available = False
+            return
+
+        try:
+            for p in [PIN_PLAY, PIN_MUSIC] + POSITION_PINS:
+                GPIO.add_event_detect(p, GPIO.BOTH, callback=self._on_edge)
+            self.edge_detection = True
+        except Exception as e:
+            # e.g. RuntimeError on kernels without GPIO edge support
+            log("WARNING", f"GPIO edge detection unavailable, polling: {e}")
+
+    def _on_edge(self, channel):
+        self._edge.set()
+
+    def needs_polling(self) -> bool:
+        """True while read_state() must be called at the debounce rate.
+
+        That is when there are no edge events to wait on, or a new reading
+        is still being confirmed by the debounce counters.
+        """
+        if not self.gpio_available:
+            return False
+        if not self.edge_detection:
+            return True
+        if self._mode_sample != self.last_mode:
+            return True
+        return self._last_sample is not None and self._last_sample > 0 and (
+            self._last_sample != self._last_confirm
+        )
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, waking early on a switch edge.
+
+        Returns True if an edge was seen. Without edge detection this is a
+        plain sleep.
+        """
+        if not self.edge_detection:
+            time.sleep(timeout)
+            return False
+        changed = self._edge.wait(timeout)
+        if changed:
+            self._edge.clear()
+            self._edge_pending = True
+        return changed
+
+    def poll_change(self) -> Optional[Tuple[SwitchState, Optional[int]]]:
+        """Return the debounced state if it changed since last returned, else None.
+
+        With edge detection, the pins aren't read at all unless an edge was
+        seen or a reading is still being debounced.
+        """
+        if self.edge_detection and not self._edge_pending and not self.needs_polling():
+            return None
+        self._edge_pending = False
+
+        state = self.read_state()
+        if state == self._reported:
+            return None
+        self._reported = state
+        return state
+
+    def _read_mode(self) -> SwitchState:
+        """Decode the 3-position mode switch (raw, not debounced)."""
+        play_low = GPIO.input(PIN_PLAY) == GPIO.LOW
+        music_low = GPIO.input(PIN_MUSIC) == GPIO.LOW
+        return _MODE_TABLE[(play_low << 1) | music_low]
 
     def _read_rotary(self) -> int:
         """Read rotary position: 1-12, 0=no contact, -1=multiple."""
-        lows = [i for i, p in enumerate(POSITION_PINS) if GPIO.input(p) == GPIO.LOW]
-        if len(lows) == 1:
-            return lows[0] + 1
-        return 0 if len(lows) == 0 else -1
+        mask = 0
+        for bit, pin in enumerate(POSITION_PINS):
+            if GPIO.input(pin) == GPIO.LOW:
+                mask |= 1 << bit
+        if mask & (mask - 1):
+            return -1  # more than one contact
+        # A single set bit's position is the knob position; no bits gives 0
+        return mask.bit_length()
 
     def read_state(self) -> Tuple[SwitchState, Optional[int]]:
         """Read current switch state and podcast index."""
@@ -72,16 +162,17 @@ class HardwareController:
             return (SwitchState.PAUSED, None)
 
         try:
-            # Mode switch
-            play_low = GPIO.input(PIN_PLAY) == GPIO.LOW
-            music_low = GPIO.input(PIN_MUSIC) == GPIO.LOW
-
-            if play_low and not music_low:
-                mode = SwitchState.PLAYING
-            elif music_low and not play_low:
-                mode = SwitchState.MUSIC_MODE
+            # Mode switch with debounce
+            raw_mode = self._read_mode()
+
+            if raw_mode == self._mode_sample:
+                self._mode_stable_count += 1
             else:
-                mode = SwitchState.PAUSED
+                self._mode_stable_count = 1
+                self._mode_sample = raw_mode
+
+            if self._mode_stable_count >= MODE_STABLE_READS:
+                self.last_mode = raw_mode
 
             # Rotary with debounce
             raw = self._read_rotary()
@@ -103,7 +194,7 @@ class HardwareController:
                 self._last_confirm_time = now
                 self.last_podcast_index = raw
 
-            return (mode, self.last_podcast_index)
+            return (self.last_mode, self.last_podcast_index)
 
         except Exception as e:
             log("ERROR", f"GPIO read error: {e}")
@@ -117,7 +208,7 @@ class HardwareController:
             try:
                 GPIO.cleanup()
             except Exception as e:
-                log("DEBUG", f"GPIO cleanup: {e}")
+                log("DEBUG", "GPIO cleanup: %s", e)
 
 
 if __name__ == "__main__":
@@ -128,14 +219,15 @@ if __name__ == "__main__":
         print("GPIO not available")
         exit(1)
 
-    last = (None, None)
     try:
         while True:
-            state, idx = ctrl.read_state()
-            if (state, idx) != last:
+            change = ctrl.poll_change()
+            if change:
+                state, idx = change
                 print(f"Mode: {state.value:15} | Podcast: {idx or 'N/A'}")
-                last = (state, idx)
-            time.sleep(0.05)
+            # Sleep until a switch edge, sampling quickly only while a new
+            # reading is being debounced
+            ctrl.wait_for_change(0.05 if ctrl.needs_polling() else 1.0)
     except KeyboardInterrupt:
         print("\nDone")
     finally:
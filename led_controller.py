@@ -2,7 +2,7 @@
 
 import time
 from enum import Enum
-from threading import Event, Thread
+from threading import Event, RLock, Thread
 
 from utils import log
 
@@ -35,6 +35,9 @@ class LEDController:
         self._stop = Event()
         self._thread = None
         self._initialized = False
+        # set_state() is called from the main loop, the background episode
+        # check and (via log) any thread that reports a warning or error
+        self._lock = RLock()
 
         if GPIO_AVAILABLE:
             try:
@@ -77,7 +80,10 @@ class LEDController:
         """Set LED state."""
         if not self._initialized:
             return
+        with self._lock:
+            self._set_state(state)
 
+    def _set_state(self, state: LEDState):
         self._stop_thread()
 
         if state in (LEDState.PLAYING, LEDState.MUSIC_MODE):
@@ -1,12 +1,17 @@
 """Music album management: discovery, track scanning, config reading."""
 
 import json
+import os
 import re
+import stat
 from pathlib import Path
 from typing import Optional
 
 from utils import log
 
+# Track file extensions (lower case); a tuple so str.endswith takes it whole
+AUDIO_EXTS = (".mp3",)
+
 
 def natural_sort_key(s: str):
     """Sort key for natural/numeric ordering: '2-foo' before '10-bar'."""
@@ -18,6 +23,16 @@ class MusicManager:
 
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
+        self._album_paths: dict = {}
+        # album_path -> (directory mtime_ns, sorted track names)
+        self._track_cache: dict = {}
+
+    def _album_path(self, album_path: str) -> Path:
+        """Path for an album folder string, cached (reused for every track)."""
+        path = self._album_paths.get(album_path)
+        if path is None:
+            path = self._album_paths[album_path] = Path(album_path)
+        return path
 
     def _read_music_config(self) -> dict:
         """Read music config fresh from config.json. Called on every knob selection."""
@@ -87,29 +102,45 @@ class MusicManager:
         return {"folder": folder, "name": name, "path": str(path)}
 
     def scan_tracks(self, album_path: str) -> list:
-        """Scan album folder for mp3 files, natural sorted. Top-level only."""
-        path = Path(album_path)
-        if not path.is_dir():
+        """Scan album folder for mp3 files, natural sorted. Top-level only.
+
+        Results are cached per folder and reused while the folder's mtime
+        (which changes when files are added, removed or renamed) is the same.
+        """
+        path = self._album_path(album_path)
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISDIR(st.st_mode):
             log("WARNING", f"Cannot scan, not a directory: {path}")
             return []
 
-        tracks = sorted(
-            [
-                f.name
-                for f in path.iterdir()
-                if f.is_file() and f.suffix.lower() == ".mp3"
-            ],
-            key=natural_sort_key,
-        )
+        cached = self._track_cache.get(album_path)
+        if cached and cached[0] == st.st_mtime_ns:
+            return list(cached[1])
+
+        # scandir's entries carry the file type from the directory listing,
+        # so is_file() doesn't stat each track
+        with os.scandir(path) as it:
+            tracks = sorted(
+                [
+                    e.name
+                    for e in it
+                    if e.name.lower().endswith(AUDIO_EXTS) and e.is_file()
+                ],
+                key=natural_sort_key,
+            )
 
         if not tracks:
             log("WARNING", f"No mp3 files found in: {path}")
 
-        return tracks
+        self._track_cache[album_path] = (st.st_mtime_ns, tracks)
+        return list(tracks)
 
     def get_track_path(self, album_path: str, filename: str) -> Path:
         """Get full path to a track file."""
-        return Path(album_path) / filename
+        return self._album_path(album_path) / filename
 
     def get_all_albums_info(self) -> list:
         """Get info for all configured/discovered albums. Used by status display."""
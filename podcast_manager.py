@@ -1,14 +1,115 @@
 """Podcast RSS feed parsing and episode downloading."""
 
 import hashlib
-import xml.etree.ElementTree as ET
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Optional
 
-import requests
+from lxml import etree
 
 from utils import log
 
+# Max RSS feeds fetched concurrently during a check
+RSS_FETCH_WORKERS = 4
+
+# Shared HTTP connection pool (feeds and downloads often hit the same CDN)
+HTTP_POOL_SIZE = 16
+HTTP_RETRIES = 3
+
+# Read size for episode downloads: large reads keep the per-chunk Python
+# overhead (write, progress check) negligible next to the network
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Episodes at least this large are fetched over several HTTP Range
+# connections when the server supports it (per-connection rate limits)
+RANGED_DOWNLOAD_MIN_SIZE = 16 * 1024 * 1024
+RANGED_DOWNLOAD_SEGMENTS = 4
+
+# Interrupted downloads are kept as <file>.partial and resumed; cleanup
+# discards partials that haven't been touched for this long (seconds)
+PARTIAL_SUFFIX = ".partial"
+PARTIAL_MAX_AGE = 24 * 3600
+
+# Feeds saying (Cache-Control max-age / Expires) they won't change for a
+# while are skipped until then, trusting them for at most this long (seconds)
+MAX_FEED_FRESHNESS = 24 * 3600
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+ATOM_URI = "http://www.w3.org/2005/Atom"
+ATOM_NS = "{" + ATOM_URI + "}"
+
+# Episode elements (RSS 2.0 item, Atom entry)
+ITEM_TAGS = ("item", ATOM_NS + "entry")
+
+# Per-item lookups, compiled once (RSS 2.0 or Atom child elements)
+_XP_NS = {"atom": ATOM_URI}
+TITLE_XPATH = etree.XPath("title | atom:title", namespaces=_XP_NS)
+ENCLOSURE_XPATH = etree.XPath(
+    'enclosure | atom:link[@rel="enclosure"]', namespaces=_XP_NS
+)
+GUID_XPATH = etree.XPath("guid | atom:id", namespaces=_XP_NS)
+PUBDATE_XPATH = etree.XPath(
+    "pubDate | atom:published | atom:updated", namespaces=_XP_NS
+)
+
+# libxml2 parser: never expand entities (billion-laughs / XXE). No recover
+# mode: an HTML error page served with 200 must fail the parse, not come back
+# as an empty feed whose cache headers would then be stored
+RSS_PARSE_OPTIONS = {"huge_tree": False, "resolve_entities": False}
+
+
+def _first(xpath: etree.XPath, item: etree._Element) -> Optional[etree._Element]:
+    """Return the first element matched by xpath under item, or None."""
+    found = xpath(item)
+    return found[0] if found else None
+
+
+def _fresh_until(headers, now: float) -> float:
+    """Timestamp until which a response may be reused, from its cache headers.
+
+    0 if the server doesn't allow caching or says nothing about it.
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    lifetime = None
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        lifetime = int(match.group(1)) - int(headers.get("Age", 0) or 0)
+    elif headers.get("Expires"):
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            # Measure against the server's Date to be immune to clock skew
+            date = headers.get("Date")
+            origin = parsedate_to_datetime(date).timestamp() if date else now
+            lifetime = expires - origin
+        except (TypeError, ValueError):
+            return 0
+    if not lifetime or lifetime <= 0:
+        return 0
+    return now + min(lifetime, MAX_FEED_FRESHNESS)
+
+
+def _parse_pub_date(text: Optional[str]) -> Optional[float]:
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date to a timestamp."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        return parsedate_to_datetime(text).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
 
 class PodcastManager:
     """Manages podcast episode fetching, downloading, and cleanup."""
@@ -18,17 +119,58 @@ class PodcastManager:
         self.state = state_manager
         self.episodes_dir = Path(config.episodes_dir)
         self.episodes_dir.mkdir(exist_ok=True)
+        self._podcast_dirs = {}
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Shared requests.Session, created on first use.
+
+        Reusing it keeps TCP/TLS connections alive across the feeds and
+        downloads of a check instead of handshaking for every request.
+        """
+        with self._session_lock:
+            if self._session is None:
+                # Imported on first use: requests + urllib3 are slow to import
+                # on a Pi and aren't needed before the first RSS check.
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # requests' default Accept-Encoding already offers gzip and
+                # deflate, plus br when the brotli package is installed; it's
+                # left alone so we never advertise a coding we can't decode.
+                session = requests.Session()
+                session.headers.update({"User-Agent": "PodcastPlayer/1.0"})
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=Retry(total=HTTP_RETRIES, backoff_factor=0.5),
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
 
     def get_podcast_dir(self, podcast_id: str) -> Path:
-        """Get/create directory for podcast."""
-        d = self.episodes_dir / podcast_id
-        d.mkdir(exist_ok=True)
+        """Get/create directory for podcast (mkdir only on first use)."""
+        d = self._podcast_dirs.get(podcast_id)
+        if d is None:
+            d = self.episodes_dir / podcast_id
+            d.mkdir(exist_ok=True)
+            self._podcast_dirs[podcast_id] = d
         return d
 
     def fetch_episodes(self, rss_url: str, podcast_id: Optional[str] = None, count: int = 1):
-        """Fetch latest episodes from RSS feed. Uses conditional GET if state_manager is available."""
+        """Fetch latest episodes from RSS feed. Uses conditional GET if state_manager is available.
+
+        Returns None if the server answered 304 Not Modified, [] on errors.
+        """
+        import requests
+
         try:
-            headers = {"User-Agent": "PodcastPlayer/1.0"}
+            headers = {}
 
             # Add conditional GET headers if we have cached values
             cached = {}
@@ -39,91 +181,146 @@ class PodcastManager:
                 if cached.get("last_modified"):
                     headers["If-Modified-Since"] = cached["last_modified"]
 
-            log("DEBUG", f"Fetching RSS: {rss_url[:50]}...")
-            resp = requests.get(
+            log("DEBUG", "Fetching RSS: %s...", rss_url[:50])
+            resp = self.session.get(
                 rss_url,
+                stream=True,
                 timeout=self.config.rss_timeout,
                 headers=headers,
             )
 
             # 304 Not Modified — feed unchanged
             if resp.status_code == 304:
-                log("DEBUG", f"Feed unchanged (304)")
-                return []
+                log("DEBUG", "Feed unchanged (304)")
+                resp.close()  # return the connection to the pool
+                if self.state and podcast_id:
+                    fresh = _fresh_until(resp.headers, time.time())
+                    self.state.save_feed_cache(
+                        podcast_id, {**cached, "fresh_until": fresh or None}
+                    )
+                return None
 
             resp.raise_for_status()
 
-            # Save cache headers for next time
+            with resp:
+                # Undo gzip/deflate transfer encoding while streaming
+                resp.raw.decode_content = True
+                episodes = self._parse_rss(resp.raw, count)
+
+            # Save cache headers for next time. Only after a successful parse:
+            # storing them first would turn a failed fetch into a 304 next
+            # hour and the episode would be missed until the feed changes.
+            # (PodcastPlayer drops them again if an episode download fails.)
             if self.state and podcast_id:
                 self.state.save_feed_cache(
                     podcast_id,
                     {
                         "etag": resp.headers.get("ETag"),
                         "last_modified": resp.headers.get("Last-Modified"),
+                        "fresh_until": _fresh_until(resp.headers, time.time()) or None,
                     },
                 )
-
-            log("DEBUG", f"RSS downloaded: {len(resp.content)} bytes")
-            return self._parse_rss(resp.content, count)
+            return episodes
         except requests.Timeout:
             log("WARNING", f"RSS timeout ({self.config.rss_timeout}s)")
         except requests.RequestException as e:
             log("ERROR", f"RSS fetch error: {e}")
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             log("ERROR", f"RSS parse error: {e}")
         return []
 
-    def _parse_rss(self, xml_content: bytes, count: int):
-        """Parse RSS XML content."""
+    def fetch_all(
+        self, feeds: dict, count: int = 1, on_result=None, pool=None
+    ) -> dict:
+        """Fetch several feeds concurrently. feeds maps podcast_id -> rss_url.
+
+        Returns {podcast_id: episodes}, where episodes is None for a feed
+        that hasn't changed (304). A failing feed yields [] without
+        holding up the others, so a check takes as long as the slowest feed
+        rather than the sum of all of them. on_result(podcast_id, episodes)
+        is called in the caller's thread as each feed completes, so work on
+        early feeds can start before the slow ones return. pool is an
+        executor to run the fetches on; without one a temporary pool of
+        RSS_FETCH_WORKERS threads is used.
+        """
+        if not feeds:
+            return {}
+        if pool is None:
+            with ThreadPoolExecutor(
+                max_workers=min(RSS_FETCH_WORKERS, len(feeds))
+            ) as own_pool:
+                return self.fetch_all(feeds, count, on_result, own_pool)
+
+        results = {}
+        futures = {
+            pool.submit(
+                self.fetch_episodes, url, podcast_id=podcast_id, count=count
+            ): podcast_id
+            for podcast_id, url in feeds.items()
+        }
+        for future in as_completed(futures):
+            podcast_id = futures[future]
+            try:
+                results[podcast_id] = future.result()
+            except Exception as e:
+                log("ERROR", f"RSS fetch failed for {podcast_id}: {e}")
+                results[podcast_id] = []
+            if on_result:
+                on_result(podcast_id, results[podcast_id])
+        return results
+
+    def _parse_rss(self, source, count: int):
+        """Parse the first count items of an RSS/Atom feed.
+
+        source is a file-like object (the streamed response). Parsing stops
+        once count items have been seen, so the rest of the feed is never
+        downloaded or built into a tree: with count=1 the cost doesn't depend
+        on how many older items the feed carries.
+        """
         episodes = []
-        root = ET.fromstring(xml_content)
-
-        # Find all items (episodes) - try different RSS formats
-        items = root.findall(".//item")
-        if not items:
-            items = root.findall(".//{http://www.w3.org/2005/Atom}entry")
-
-        log("DEBUG", f"Found {len(items)} items in RSS")
+        seen = 0
 
-        for item in items[:count]:
-            episode = self._extract_episode_info(item)
+        # tag= makes libxml2 report only item/entry ends, so the children
+        # (title, enclosure, ...) never surface as Python-level events
+        events = etree.iterparse(
+            source, events=("end",), tag=ITEM_TAGS, **RSS_PARSE_OPTIONS
+        )
+        for _, elem in events:
+            episode = self._extract_episode_info(elem)
             if episode:
                 episodes.append(episode)
-                if len(episodes) >= count:
-                    break
-
+            seen += 1
+            if seen >= count:
+                break
+            # Drop the finished item and any earlier siblings
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+        log("DEBUG", "Parsed %d items from RSS", seen)
         return episodes
 
-    def _extract_episode_info(self, item: ET.Element):
+    def _extract_episode_info(self, item: etree._Element):
         """Extract episode information from RSS item."""
         try:
             # Extract title
-            title_elem = item.find("title")
-            if title_elem is None:
-                title_elem = item.find("{http://www.w3.org/2005/Atom}title")
-
+            title_elem = _first(TITLE_XPATH, item)
             title = title_elem.text if title_elem is not None else "Unknown Episode"
 
             # Extract audio URL from enclosure
-            enclosure = item.find("enclosure")
-            if enclosure is None:
-                enclosure = item.find(
-                    '{http://www.w3.org/2005/Atom}link[@rel="enclosure"]'
-                )
+            enclosure = _first(ENCLOSURE_XPATH, item)
 
             if enclosure is None:
-                log("DEBUG", f"No enclosure found for: {title}")
+                log("DEBUG", "No enclosure found for: %s", title)
                 return None
 
             url = enclosure.get("url") or enclosure.get("href")
             if not url:
-                log("DEBUG", f"No URL in enclosure for: {title}")
+                log("DEBUG", "No URL in enclosure for: %s", title)
                 return None
 
             # Extract GUID (unique identifier)
-            guid_elem = item.find("guid")
-            if guid_elem is None:
-                guid_elem = item.find("{http://www.w3.org/2005/Atom}id")
+            guid_elem = _first(GUID_XPATH, item)
 
             guid = guid_elem.text if guid_elem is not None else url
 
@@ -135,50 +332,95 @@ class PodcastManager:
             else:
                 title = "Unknown Episode"
 
-            return {"title": title, "url": url, "guid": guid}
+            pub_elem = _first(PUBDATE_XPATH, item)
+            published = _parse_pub_date(pub_elem.text if pub_elem is not None else None)
+
+            return {"title": title, "url": url, "guid": guid, "published": published}
 
         except Exception as e:
             log("ERROR", f"Error extracting episode info: {e}")
             return None
 
     def download_episode(self, episode: dict, podcast_id: str):
-        """Download episode audio file. Returns filename or None."""
-        filename = (
-            f"episode_{hashlib.md5(episode['guid'].encode()).hexdigest()[:12]}.mp3"
-        )
+        """Download episode audio file. Returns filename or None.
+
+        Data is written to <filename>.partial and renamed on completion; a
+        failed download leaves the .partial behind so the next attempt can
+        resume it with a Range request.
+        """
+        import requests
+
+        digest = hashlib.blake2b(episode["guid"].encode(), digest_size=6).hexdigest()
+        filename = f"episode_{digest}.mp3"
         filepath = self.get_podcast_dir(podcast_id) / filename
+        partial = filepath.with_name(filename + PARTIAL_SUFFIX)
 
         if filepath.exists():
             log("INFO", f"Already exists: {episode['title'][:50]}")
             return filename
 
-        log("INFO", f"Downloading: {episode['title'][:50]}...")
+        resume_from = partial.stat().st_size if partial.exists() else 0
+        if resume_from:
+            log("INFO", f"Resuming: {episode['title'][:50]} from {resume_from} bytes")
+        else:
+            log("INFO", f"Downloading: {episode['title'][:50]}...")
         try:
-            resp = requests.get(
+            if not resume_from and self._download_ranged(episode["url"], filepath):
+                size_mb = filepath.stat().st_size / 1024 / 1024
+                log("INFO", f"Downloaded: {filename} ({size_mb:.1f} MB)")
+                return filename
+
+            headers = {}
+            if resume_from:
+                headers["Range"] = f"bytes={resume_from}-"
+            resp = self.session.get(
                 episode["url"],
                 stream=True,
                 timeout=self.config.download_timeout,
-                headers={"User-Agent": "PodcastPlayer/1.0"},
+                headers=headers,
             )
+            if resp.status_code == 416:
+                # Partial no longer matches the file on the server
+                log("DEBUG", "Range not satisfiable, restarting download")
+                resp.close()
+                resume_from = 0
+                headers.pop("Range", None)
+                resp = self.session.get(
+                    episode["url"],
+                    stream=True,
+                    timeout=self.config.download_timeout,
+                    headers=headers,
+                )
             resp.raise_for_status()
 
-            total_size = int(resp.headers.get("content-length", 0))
-            downloaded = 0
-            last_percent = -1
+            if resume_from and resp.status_code != 206:
+                log("DEBUG", "Server ignored Range, restarting download")
+                resume_from = 0
 
-            with open(filepath, "wb") as f:
-                for chunk in resp.iter_content(8192):
+            total_size = int(resp.headers.get("content-length", 0))
+            if total_size:
+                total_size += resume_from
+            downloaded = resume_from
+            # Progress is logged every 10%: compare against the next byte
+            # mark instead of computing a percentage for every chunk
+            step = max(total_size // 10, 1)
+            next_mark = downloaded - downloaded % step
+
+            with open(partial, "ab" if resume_from else "wb") as f:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
                     if chunk:
                         f.write(chunk)
                         downloaded += len(chunk)
-                        if total_size > 0:
-                            percent = (downloaded / total_size) * 100
-                            if percent // 10 > last_percent:
-                                last_percent = percent // 10
-                                log(
-                                    "DEBUG",
-                                    f"Download progress: {int(last_percent * 10)}%",
-                                )
+                        if total_size and downloaded >= next_mark:
+                            decile = min(downloaded // step, 10)
+                            next_mark = (decile + 1) * step
+                            log("DEBUG", "Download progress: %d%%", decile * 10)
+
+            if total_size and downloaded < total_size:
+                raise requests.RequestException(
+                    f"Connection closed at {downloaded}/{total_size} bytes"
+                )
+            partial.rename(filepath)
 
             size_mb = filepath.stat().st_size / 1024 / 1024
             log("INFO", f"Downloaded: {filename} ({size_mb:.1f} MB)")
@@ -191,42 +433,147 @@ class PodcastManager:
         except IOError as e:
             log("ERROR", f"File write error: {e}")
 
-        # Clean up partial download
-        if filepath.exists():
-            try:
-                filepath.unlink()
-                log("DEBUG", "Removed partial download")
-            except:
-                pass
+        if partial.exists():
+            log("DEBUG", "Kept partial download for resume")
         return None
 
+    def _download_ranged(self, url: str, filepath: Path) -> bool:
+        """Download url into filepath over parallel Range requests.
+
+        Returns False when ranges aren't usable (no Accept-Ranges, file too
+        small, a server answering 200 instead of 206, or a network error)
+        so the caller can fall back to a single streamed request, which
+        leaves a resumable .partial if it fails too.
+        """
+        import requests
+
+        headers = {"Accept-Encoding": "identity"}
+        try:
+            head = self.session.head(
+                url,
+                allow_redirects=True,
+                timeout=self.config.download_timeout,
+                headers=headers,
+            )
+        except requests.RequestException as e:
+            log("DEBUG", "HEAD failed, skipping ranged download: %s", e)
+            return False
+        if head.status_code != 200:
+            return False
+        if head.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return False
+        total_size = int(head.headers.get("Content-Length", 0))
+        if total_size < RANGED_DOWNLOAD_MIN_SIZE:
+            return False
+
+        # Follow redirects once, not once per segment
+        url = head.url
+        step = -(-total_size // RANGED_DOWNLOAD_SEGMENTS)
+        segments = [
+            (start, min(start + step, total_size) - 1)
+            for start in range(0, total_size, step)
+        ]
+        log("DEBUG", "Ranged download: %d segments of %d bytes", len(segments), step)
+
+        # Segments land out of order, so this can't double as a resumable
+        # .partial; it's written to its own temp file and dropped on failure.
+        tmp = filepath.with_name(filepath.name + ".ranged")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        ok = False
+        try:
+            with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [
+                    pool.submit(self._fetch_range, url, headers, fd, start, end)
+                    for start, end in segments
+                ]
+            ok = all(f.result() for f in futures)
+        except requests.RequestException as e:
+            log("DEBUG", "Ranged download failed, falling back: %s", e)
+        finally:
+            os.close(fd)
+            if ok:
+                tmp.rename(filepath)
+            else:
+                tmp.unlink(missing_ok=True)
+        return ok
+
+    def _fetch_range(self, url: str, headers: dict, fd: int, start: int, end: int):
+        """Fetch bytes start-end of url and pwrite them at their offset."""
+        import requests
+
+        resp = self.session.get(
+            url,
+            stream=True,
+            timeout=self.config.download_timeout,
+            headers={**headers, "Range": f"bytes={start}-{end}"},
+        )
+        with resp:
+            if resp.status_code != 206:
+                return False
+            offset = start
+            for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+
+        if offset != end + 1:
+            raise requests.RequestException(
+                f"Incomplete range {start}-{end} ({offset - start} bytes)"
+            )
+        return True
+
     def cleanup_old_episodes(self, podcast_id: str, keep_files: list):
         """Delete episodes not in keep list."""
+        keep = set(keep_files)
         try:
-            for f in self.get_podcast_dir(podcast_id).iterdir():
-                if f.is_file() and f.name not in keep_files:
+            now = time.time()
+            with os.scandir(self.get_podcast_dir(podcast_id)) as it:
+                for f in it:
+                    if not f.is_file(follow_symlinks=False) or f.name in keep:
+                        continue
+                    # Keep recent partial downloads so they can be resumed
+                    if (
+                        f.name.endswith(PARTIAL_SUFFIX)
+                        and now - f.stat().st_mtime < PARTIAL_MAX_AGE
+                    ):
+                        continue
                     log("INFO", f"Removing old episode: {f.name}")
-                    f.unlink()
+                    os.unlink(f.path)
         except Exception as e:
             log("ERROR", f"Error during cleanup: {e}")
 
     def get_episode_path(self, podcast_id: str, filename: str) -> Path:
         return self.get_podcast_dir(podcast_id) / filename
 
-    def get_storage_info(self):
-        """Get storage usage statistics."""
-        total_size, count = 0, 0
+    def scan_episode_files(self) -> dict:
+        """Walk episodes_dir once: {podcast_id: {filename: size in bytes}}.
+
+        scandir's DirEntry answers is_dir/is_file from the directory
+        listing itself, so only the size lookups cost a stat().
+        """
+        scan = {}
         try:
-            for pdir in self.episodes_dir.iterdir():
-                if pdir.is_dir():
-                    for f in pdir.iterdir():
-                        if f.is_file():
-                            total_size += f.stat().st_size
-                            count += 1
+            with os.scandir(self.episodes_dir) as it:
+                for pdir in it:
+                    if not pdir.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(pdir.path) as files:
+                        scan[pdir.name] = {
+                            f.name: f.stat().st_size
+                            for f in files
+                            if f.is_file(follow_symlinks=False)
+                        }
         except Exception as e:
-            log("ERROR", f"Error getting storage info: {e}")
+            log("ERROR", f"Error scanning episodes: {e}")
+        return scan
+
+    def get_storage_info(self, scan: Optional[dict] = None):
+        """Get storage usage statistics, from scan_episode_files() output
+        if the caller already has it."""
+        if scan is None:
+            scan = self.scan_episode_files()
+        sizes = [size for files in scan.values() for size in files.values()]
         return {
-            "total_size_mb": total_size / 1024 / 1024,
-            "episode_count": count,
+            "total_size_mb": sum(sizes) / 1024 / 1024,
+            "episode_count": len(sizes),
             "episodes_dir": str(self.episodes_dir),
         }
@@ -1,11 +1,11 @@
 """Main podcast player controller coordinating all components."""
 
+import statistics
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
-import schedule
-
 from audio_player import AudioPlayer
 from config import Config
 from eink_display import EinkDisplay
@@ -16,8 +16,15 @@ from podcast_manager import PodcastManager
 from state_manager import StateManager
 from utils import log, set_led_controller
 
-# How often to poll in run-loop (seconds)
+# How often to poll in run-loop while a switch reading is settling, or
+# always when GPIO edge detection is unavailable (seconds)
 POLL_INTERVAL = 0.2
+# Loop period when idle: switch edges wake the loop early, so this only
+# bounds end-of-media detection and the hourly check (seconds)
+IDLE_POLL_INTERVAL = 1.0
+# With nothing loaded and no check pending, the loop sleeps until the next
+# scheduled check, capped at this (seconds)
+MAX_IDLE_WAIT = 60
 
 # How often to refresh the e-ink progress bar during playback (seconds)
 DISPLAY_UPDATE_INTERVAL = 10
@@ -31,6 +38,20 @@ ROTARY_WARMUP_INTERVAL = 0.05  # seconds between reads
 IDLE_DEBOUNCE_SECONDS = 30  # audio must be idle this long before a deferred check runs
 MAX_STALENESS_SECONDS = 2.5 * 3600  # force a check despite playback if older than this
 
+# Position ticks closer than this to the previous one are not stored (seconds)
+POSITION_EPSILON = 0.5
+
+# Adaptive feed checks: a feed is fetched every
+# median(gap between its episodes) * FEED_INTERVAL_FRACTION, but at most once
+# per check_interval_hours and at least once per FEED_INTERVAL_MAX.
+# A feed due within FEED_CHECK_SLACK of a check is included in it.
+FEED_INTERVAL_FRACTION = 0.25
+FEED_INTERVAL_MAX = 7 * 24 * 3600
+FEED_CHECK_SLACK = 10 * 60
+
+# Threads shared by feed fetches and episode downloads during a check
+IO_WORKERS = 8
+
 
 class PodcastPlayer:
     """Main controller for the podcast player system."""
@@ -53,6 +74,14 @@ class PodcastPlayer:
         self.hardware = HardwareController()
         self.display = EinkDisplay()
 
+        # State keys for each configured podcast, by knob position - 1
+        self.podcast_ids = tuple(
+            f"podcast_{i + 1}" for i in range(len(config.podcasts))
+        )
+        self.podcast_names = tuple(pc["name"] for pc in config.podcasts)
+        # Music state keys, indexed by knob position (1-12)
+        self.music_ids = tuple(f"music_{n}" for n in range(13))
+
         # Podcast state
         self.current_podcast_id: Optional[str] = None
         self.current_episode_index: Optional[int] = None
@@ -60,24 +89,54 @@ class PodcastPlayer:
         # Music state
         self.current_music_id: Optional[str] = None
         self.current_music_album_path: Optional[str] = None
+        self.current_music_folder: Optional[str] = None
         self.current_music_tracks: Optional[list] = None
         self.current_music_track_index: Optional[int] = None
 
         # Shared state
         self.current_mode = SwitchState.PAUSED
+        # current_mode == MUSIC_MODE, kept in step wherever current_mode is set
+        self._music_mode = False
         self.current_podcast_index: Optional[int] = None
 
+        # Switch dispatch: entering a mode, and turning the knob within one.
+        # While paused the knob only previews the selection on the display.
+        self._mode_handlers = {
+            SwitchState.PAUSED: self._enter_paused,
+            SwitchState.PLAYING: self._enter_podcast,
+            SwitchState.MUSIC_MODE: self._enter_music,
+        }
+        self._knob_handlers = {
+            SwitchState.PLAYING: self.switch_to_podcast,
+            SwitchState.MUSIC_MODE: self.switch_to_album,
+            SwitchState.PAUSED: self._update_display_preview,
+        }
+
         # Display timing
         self._last_display_update = 0.0
 
+        # (episode/track target, position) of the last stored position tick
+        self._last_tick = None
+
+        # podcast_id -> (episode file, Path) already found on disk; dropped
+        # whenever a check rewrites that podcast's episode list
+        self._checked_paths: dict = {}
+
         # RSS check deferral
         self._check_deferred = False
         self._audio_idle_since = time.time()  # idle on startup
 
-        log("INFO", "Initialization complete")
+        # Background RSS check (worker thread and its (results, downloaded))
+        self._check_thread: Optional[threading.Thread] = None
+        self._check_result = None
+        self._next_check_at = 0.0  # set in run()
+        # Feed fetches and episode downloads share one long-lived pool, so
+        # its threads are reused across checks instead of respawned
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=IO_WORKERS, thread_name_prefix="pp-io"
+        )
 
-    def _is_music_mode(self) -> bool:
-        return self.current_mode == SwitchState.MUSIC_MODE
+        log("INFO", "Initialization complete")
 
     # --- Display helpers ---
 
@@ -87,7 +146,7 @@ class PodcastPlayer:
             return
 
         try:
-            if self._is_music_mode():
+            if self._music_mode:
                 self._update_display_music()
             elif self.current_mode == SwitchState.PLAYING:
                 self._update_display_podcast()
@@ -112,7 +171,7 @@ class PodcastPlayer:
         idx = int(self.current_podcast_id.split("_")[1]) - 1
         if idx < 0 or idx >= len(self.config.podcasts):
             return
-        name = self.config.podcasts[idx]["name"]
+        name = self.podcast_names[idx]
 
         # Get episode info from state
         ps = self.state.get_podcast(self.current_podcast_id)
@@ -208,8 +267,8 @@ class PodcastPlayer:
         if idx < 0 or idx >= len(self.config.podcasts):
             return
 
-        name = self.config.podcasts[idx]["name"]
-        podcast_id = f"podcast_{knob_position}"
+        name = self.podcast_names[idx]
+        podcast_id = self.podcast_ids[idx]
         ps = self.state.get_podcast(podcast_id)
 
         if not ps["episodes"]:
@@ -246,7 +305,7 @@ class PodcastPlayer:
         if not album:
             return
 
-        music_id = f"music_{knob_position}"
+        music_id = self.music_ids[knob_position]
         ms = self.state.get_music(music_id)
         name = album["name"]
 
@@ -279,72 +338,114 @@ class PodcastPlayer:
             icon="music",
         )
 
-    def _capture_duration(self):
-        """Read duration from VLC and store it. Called once right after play().
+    def _duration_target(self) -> tuple:
+        """Identify the episode/track currently loaded."""
+        if self._music_mode:
+            return ("music", self.current_music_id, self.current_music_track_index)
+        return ("podcast", self.current_podcast_id, self.current_episode_index)
 
-        VLC needs a moment to parse the file, so _get_duration_internal() polls
-        for up to 2 seconds. This blocks briefly but only runs once per
-        episode/track — if duration is already in state, it's skipped entirely.
+    def _capture_duration(self):
+        """Store the duration play() read from VLC. Called once right after
+        play(), and only when the episode/track has no stored duration yet.
         """
-        duration = self.audio._get_duration_internal(timeout=2.0)
+        duration = self.audio.duration
         if duration <= 0:
             log("DEBUG", "Could not read duration from VLC")
             return
 
-        if self._is_music_mode():
-            if self.current_music_id:
-                self.state.update_music_track_duration(self.current_music_id, duration)
-                log("DEBUG", f"Music track duration: {duration:.1f}s")
+        kind, item_id, index = self._duration_target()
+        if item_id is None or index is None:
+            return
+        if kind == "music":
+            self.state.update_music_track_duration(item_id, duration)
+            log("DEBUG", "Music track duration: %.1fs", duration)
         else:
-            if (
-                self.current_podcast_id is not None
-                and self.current_episode_index is not None
-            ):
-                self.state.update_episode_duration(
-                    self.current_podcast_id, self.current_episode_index, duration
-                )
-                log("DEBUG", f"Episode duration: {duration:.1f}s")
+            self.state.update_episode_duration(item_id, index, duration)
+            log("DEBUG", "Episode duration: %.1fs", duration)
+        # Have the main loop redraw the progress bar with the duration
+        self._last_display_update = 0.0
 
     # --- Position saving ---
 
     def _save_position(self, position: float):
-        """Position callback from AudioPlayer. Routes to podcast or music."""
-        if self._is_music_mode():
+        """Position callback from AudioPlayer. Routes to podcast or music.
+
+        Ticks that haven't moved since the last one (paused, buffering) are
+        dropped before touching state.
+        """
+        target = self._duration_target()
+        last = self._last_tick
+        if (
+            last is not None
+            and last[0] == target
+            and abs(position - last[1]) < POSITION_EPSILON
+        ):
+            return
+        self._last_tick = (target, position)
+
+        if self._music_mode:
             self._save_music_position(position)
         else:
             self._save_podcast_position(position)
 
-    def _save_podcast_position(self, position: float):
+    def _save_podcast_position(self, position: float, flush: bool = False):
         if (
             self.current_podcast_id is not None
             and self.current_episode_index is not None
         ):
             self.state.update_position(
-                self.current_podcast_id, self.current_episode_index, position
+                self.current_podcast_id, self.current_episode_index, position, flush
             )
 
-    def _save_music_position(self, position: float):
+    def _save_music_position(self, position: float, flush: bool = False):
         if (
             self.current_music_id is not None
             and self.current_music_track_index is not None
         ):
             self.state.update_music_position(
-                self.current_music_id, self.current_music_track_index, position
+                self.current_music_id, self.current_music_track_index, position, flush
             )
 
     def _save_current_position(self):
-        """Save current playback position if audio is active."""
+        """Save current playback position to disk if audio is active.
+
+        Periodic saves from the AudioPlayer thread are coalesced by
+        StateManager; this is the flush point for pause, switches and shutdown.
+        """
         if self.audio.is_active():
+            self._credit_listening()
             pos = self.audio.get_position()
-            if self._is_music_mode():
-                self._save_music_position(pos)
+            if self._music_mode:
+                self._save_music_position(pos, flush=True)
             elif self.current_podcast_id:
-                self._save_podcast_position(pos)
+                self._save_podcast_position(pos, flush=True)
+
+    def _credit_listening(self):
+        """Add playback time since the last credit to the current podcast's
+        or album's total_time."""
+        seconds = self.audio.take_listened()
+        if seconds <= 0:
+            return
+        if self._music_mode:
+            target = self.current_music_id
+        else:
+            target = self.current_podcast_id
+        if target is not None:
+            self.state.add_listening_time(target, seconds)
 
     # --- Podcast mode ---
 
-    def check_for_new_episodes(self):
-        """Check RSS feeds for new episodes."""
+    def check_for_new_episodes(self, background: bool = True):
+        """Check RSS feeds for new episodes.
+
+        Fetching and downloading run on a worker thread so the main loop
+        keeps handling switches; _poll_check() applies the results on the
+        main thread once it finishes. background=False runs inline (startup).
+        """
+        if self._check_thread is not None:
+            log("DEBUG", "Check already in progress")
+            return
+
         too_stale = (
             time.time() - self.state.get_last_check() >= MAX_STALENESS_SECONDS
         )
@@ -356,52 +457,169 @@ class PodcastPlayer:
         if self.audio.is_playing() and too_stale:
             log("WARNING", "Forcing RSS check despite playback (last check too stale).")
 
-        log(
-            "INFO",
-            f"[{datetime.now().strftime('%H:%M:%S')}] Checking for new episodes...",
-        )
+        log("INFO", "Checking for new episodes...")
         self.led.set_state(LEDState.REFRESHING)
+        self._check_deferred = False
 
-        updated = 0
-        for idx, pc in enumerate(self.config.podcasts):
-            podcast_id = f"podcast_{idx + 1}"
+        # Snapshot what we already have; the worker doesn't touch podcast state
+        feeds, known = {}, {}
+        now = time.time()
+        for podcast_id, pc in zip(self.podcast_ids, self.config.podcasts):
+            # Due once both our own cadence and the server's cache lifetime
+            # (Cache-Control / Expires) have run out
+            due = max(
+                self.state.get_next_feed_check(podcast_id),
+                self.state.get_feed_cache(podcast_id).get("fresh_until", 0),
+            )
+            if due > now + FEED_CHECK_SLACK:
+                log("DEBUG", "Not due yet: %s", pc["name"])
+                continue
             log("INFO", f"Checking: {pc['name']}")
+            feeds[podcast_id] = pc["rss_url"]
+            known[podcast_id] = self.state.known_guids(podcast_id)
 
-            try:
-                episodes = self.podcast_manager.fetch_episodes(
-                    pc["rss_url"], podcast_id=podcast_id, count=1
+        if not background:
+            self._finish_check(*self._fetch_new_episodes(feeds, known))
+            return
+
+        self._check_thread = threading.Thread(
+            target=self._run_check, args=(feeds, known), name="rss-check", daemon=True
+        )
+        self._check_thread.start()
+
+    def _run_check(self, feeds: dict, known: dict):
+        """Worker thread body for a background check."""
+        try:
+            self._check_result = self._fetch_new_episodes(feeds, known)
+        except Exception as e:
+            log("ERROR", f"Episode check failed: {e}")
+            self._check_result = ({}, {})
+
+    def _poll_check(self):
+        """Apply a finished background check (called from the main loop)."""
+        if self._check_thread is None or self._check_thread.is_alive():
+            return
+        self._check_thread.join()
+        self._check_thread = None
+        results, downloaded = self._check_result
+        self._check_result = None
+        self._finish_check(results, downloaded)
+
+    def _fetch_new_episodes(self, feeds: dict, known: dict):
+        """Fetch all feeds and download episodes not in known.
+
+        Downloads are queued as soon as their feed has been parsed, so they
+        overlap with the feeds still being fetched. Returns (results,
+        downloaded) for _finish_check(); downloaded maps
+        (podcast_id, guid) to the filename, or None if the download failed.
+        """
+        downloaded = {}
+        futures = {}
+
+        def queue_downloads(podcast_id: str, episodes: Optional[list]):
+            if episodes is None:
+                return  # 304, nothing new
+            for ep in episodes[: self.config.max_episodes]:
+                if ep["guid"] in known[podcast_id]:
+                    continue
+                if not futures:
+                    self.led.set_state(LEDState.DOWNLOADING)
+                log("INFO", f"New: {ep['title'][:50]}...")
+                future = self._io_pool.submit(
+                    self.podcast_manager.download_episode, ep, podcast_id
                 )
+                futures[future] = (podcast_id, ep["guid"])
+
+        results = self.podcast_manager.fetch_all(
+            feeds, count=1, on_result=queue_downloads, pool=self._io_pool
+        )
+
+        for future in as_completed(futures):
+            try:
+                downloaded[futures[future]] = future.result()
+            except Exception as e:
+                log("ERROR", f"Download failed: {e}")
+                downloaded[futures[future]] = None
+        return results, downloaded
+
+    def _finish_check(self, results: dict, downloaded: dict):
+        """Merge fetched episodes into state and restore the LED."""
+        updated = 0
+        now = time.time()
+        for podcast_id, pc in zip(self.podcast_ids, self.config.podcasts):
+            if podcast_id not in results:
+                continue  # not due this time
+            try:
+                episodes = results[podcast_id]
+                if episodes is None:
+                    log("DEBUG", "Feed unchanged for %s", pc["name"])
+                    self._schedule_feed(podcast_id, [], now)
+                    continue
                 if not episodes:
-                    log("DEBUG", f"No new episodes for {pc['name']}")
+                    # Fetch error or no usable items: stay due for next check
+                    log("DEBUG", "No new episodes for %s", pc["name"])
                     continue
-                if self._update_episodes(podcast_id, episodes):
+                if self._update_episodes(podcast_id, episodes, downloaded):
                     updated += 1
+                failed = any(
+                    downloaded.get((podcast_id, ep["guid"]), "") is None
+                    for ep in episodes
+                )
+                if failed:
+                    # fetch_episodes already stored this response's ETag and
+                    # Last-Modified; drop them so the next check gets the
+                    # full feed instead of a 304 and retries the download
+                    self.state.save_feed_cache(podcast_id, {})
+                else:
+                    self._schedule_feed(podcast_id, episodes, now)
             except Exception as e:
                 log("ERROR", f"Error checking {pc['name']}: {e}")
 
         self.state.set_last_check(time.time())
-        self._check_deferred = False
         log("INFO", f"Check complete. Updated {updated} podcast(s).")
         log("INFO", f"Next check in {self.config.check_interval_hours} hours")
 
         # Restore LED state
-        if self.audio.is_playing():
-            self.led.set_state(LEDState.PLAYING)
-        else:
-            self.led.set_state(LEDState.PAUSED)
+        self.led.set_state(
+            LEDState.PLAYING if self.audio.is_playing() else LEDState.PAUSED
+        )
+
+    def _schedule_feed(self, podcast_id: str, episodes: list, now: float):
+        """Set when this feed is next due, from how often it publishes.
+
+        Feeds with fewer than two known publication times are fetched on
+        every check.
+        """
+        pub_times = self.state.add_pub_times(
+            podcast_id, [ep["published"] for ep in episodes if ep.get("published")]
+        )
+        if len(pub_times) < 2:
+            self.state.set_next_feed_check(podcast_id, 0)
+            return
+
+        gaps = [b - a for a, b in zip(pub_times, pub_times[1:])]
+        interval = statistics.median(gaps) * FEED_INTERVAL_FRACTION
+        interval = max(interval, self.config.check_interval_hours * 3600)
+        interval = min(interval, FEED_INTERVAL_MAX)
+        self.state.set_next_feed_check(podcast_id, now + interval)
+        log("DEBUG", "%s next due in %.1fh", podcast_id, interval / 3600)
+
+    def _update_episodes(self, podcast_id: str, episodes: list, downloaded: dict) -> bool:
+        """Update episodes for a podcast from the fetched feed.
 
-    def _update_episodes(self, podcast_id: str, episodes: list) -> bool:
-        """Update episodes for a podcast. Returns True if updated."""
+        downloaded maps (podcast_id, guid) to the filename returned by
+        _fetch_new_episodes. Returns True if updated.
+        """
         ps = self.state.get_podcast(podcast_id)
-        existing_guids = {ep["guid"] for ep in ps["episodes"]}
+        by_guid = {ep["guid"]: ep for ep in ps["episodes"]}
         new_eps = []
         updated = False
 
-        for ep in episodes:
-            if ep["guid"] not in existing_guids:
-                log("INFO", f"New: {ep['title'][:50]}...")
-                self.led.set_state(LEDState.DOWNLOADING)
-                filename = self.podcast_manager.download_episode(ep, podcast_id)
+        # Only the newest max_episodes are kept, so don't look past them
+        for ep in episodes[: self.config.max_episodes]:
+            existing = by_guid.get(ep["guid"])
+            if existing is None:
+                filename = downloaded.get((podcast_id, ep["guid"]))
                 if filename:
                     new_eps.append(
                         {
@@ -414,16 +632,13 @@ class PodcastPlayer:
                     )
                     updated = True
             else:
-                for existing in ps["episodes"]:
-                    if existing["guid"] == ep["guid"]:
-                        new_eps.append(existing)
-                        break
+                new_eps.append(existing)
 
         if updated:
-            ps["episodes"] = new_eps[: self.config.max_episodes]
-            keep = [e["file"] for e in ps["episodes"]]
+            self._checked_paths.pop(podcast_id, None)
+            self.state.set_episodes(podcast_id, new_eps)
+            keep = [e["file"] for e in new_eps]
             self.podcast_manager.cleanup_old_episodes(podcast_id, keep)
-            self.state.save()
 
         return updated
 
@@ -433,10 +648,12 @@ class PodcastPlayer:
             log("WARNING", f"Invalid podcast: {podcast_index}")
             return
 
-        podcast_id = f"podcast_{podcast_index}"
-        name = self.config.podcasts[podcast_index - 1]["name"]
+        podcast_id = self.podcast_ids[podcast_index - 1]
+        name = self.podcast_names[podcast_index - 1]
         log("INFO", f"Switching to podcast {podcast_index}: {name}")
 
+        # Save current position before switching
+        self._save_current_position()
         self.audio.stop()
         ps = self.state.get_podcast(podcast_id)
 
@@ -454,12 +671,16 @@ class PodcastPlayer:
 
         ep_idx = min(ps.get("current_index", 0), len(ps["episodes"]) - 1)
         ep = ps["episodes"][ep_idx]
-        path = self.podcast_manager.get_episode_path(podcast_id, ep["file"])
-
-        if not path.exists():
-            log("ERROR", f"File not found: {path}")
-            self.led.set_state(LEDState.PAUSED)
-            return
+        checked = self._checked_paths.get(podcast_id)
+        if checked and checked[0] == ep["file"]:
+            path = checked[1]
+        else:
+            path = self.podcast_manager.get_episode_path(podcast_id, ep["file"])
+            if not path.exists():
+                log("ERROR", f"File not found: {path}")
+                self.led.set_state(LEDState.PAUSED)
+                return
+            self._checked_paths[podcast_id] = (ep["file"], path)
 
         self.current_podcast_id = podcast_id
         self.current_podcast_index = podcast_index
@@ -468,6 +689,7 @@ class PodcastPlayer:
         # Clear music state
         self.current_music_id = None
         self.current_music_album_path = None
+        self.current_music_folder = None
         self.current_music_tracks = None
         self.current_music_track_index = None
 
@@ -493,7 +715,7 @@ class PodcastPlayer:
             self.led.set_state(LEDState.PAUSED)
             return
 
-        music_id = f"music_{knob_position}"
+        music_id = self.music_ids[knob_position]
         log("INFO", f"Switching to album {knob_position}: {album['name']}")
 
         # Save current position before switching
@@ -538,6 +760,7 @@ class PodcastPlayer:
         # Set music state
         self.current_music_id = music_id
         self.current_music_album_path = album["path"]
+        self.current_music_folder = album["folder"]
         self.current_music_tracks = tracks
         self.current_music_track_index = track_idx
 
@@ -611,7 +834,7 @@ class PodcastPlayer:
         # Save state for next track
         self.state.save_music(
             self.current_music_id,
-            self.state.get_music(self.current_music_id).get("folder", ""),
+            self.current_music_folder or "",
             self.current_music_tracks,
             next_idx,
             0.0,
@@ -661,33 +884,30 @@ class PodcastPlayer:
             self._save_current_position()
 
             self.current_mode = state
-
-            if state == SwitchState.PAUSED:
-                self.pause()
-
-            elif state == SwitchState.PLAYING:
-                # Podcast mode
-                self.audio.stop()
-                if podcast_index:
-                    self.switch_to_podcast(podcast_index)
-
-            elif state == SwitchState.MUSIC_MODE:
-                # Music mode
-                self.audio.stop()
-                if podcast_index:
-                    self.switch_to_album(podcast_index)
+            self._music_mode = state == SwitchState.MUSIC_MODE
+            handler = self._mode_handlers.get(state)
+            if handler:
+                handler(podcast_index)
 
         elif knob_changed and podcast_index:
             log("INFO", f"Knob selection: {podcast_index}")
             self.current_podcast_index = podcast_index
+            handler = self._knob_handlers.get(state)
+            if handler:
+                handler(podcast_index)
 
-            if state == SwitchState.PLAYING:
-                self.switch_to_podcast(podcast_index)
-            elif state == SwitchState.MUSIC_MODE:
-                self.switch_to_album(podcast_index)
-            elif state == SwitchState.PAUSED:
-                # Show preview of the selected position on the display
-                self._update_display_preview(podcast_index)
+    def _enter_paused(self, podcast_index):
+        self.pause()
+
+    def _enter_podcast(self, podcast_index):
+        self.audio.stop()
+        if podcast_index:
+            self.switch_to_podcast(podcast_index)
+
+    def _enter_music(self, podcast_index):
+        self.audio.stop()
+        if podcast_index:
+            self.switch_to_album(podcast_index)
 
     def _wait_for_rotary(self):
         """Poll the rotary switch until debounce settles on a stable position.
@@ -701,7 +921,21 @@ class PodcastPlayer:
         for _ in range(ROTARY_WARMUP_READS):
             self.hardware.read_state()
             time.sleep(ROTARY_WARMUP_INTERVAL)
-        log("DEBUG", f"Rotary settled on position {self.hardware.last_podcast_index}")
+        log("DEBUG", "Rotary settled on position %s", self.hardware.last_podcast_index)
+
+    def _next_check_time(self, now: float) -> float:
+        """Next round local hour (HH:00) where HH is a multiple of check_interval_hours."""
+        t = time.localtime(now)
+        interval = self.config.check_interval_hours
+        for step in range(1, 25):
+            # mktime normalises hour overflow into the next day and picks the
+            # right DST offset (isdst=-1)
+            at = time.mktime(
+                (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour + step, 0, 0, 0, 0, -1)
+            )
+            if time.localtime(at).tm_hour % interval == 0:
+                return at
+        return now + interval * 3600
 
     def run(self):
         """Main event loop."""
@@ -721,26 +955,36 @@ class PodcastPlayer:
         if self.skip_initial_check:
             log("INFO", "Skipping initial episode check (--skip-check)")
         else:
-            self.check_for_new_episodes()
+            self.check_for_new_episodes(background=False)
 
         # checking for new episodes only on full hours on the clock
-        # schedule.every(self.config.check_interval_hours).hours.do(self.check_for_new_episodes)
-        for h in range(0, 24, self.config.check_interval_hours):
-            schedule.every().day.at(f"{h:02d}:00").do(self.check_for_new_episodes)
+        self._next_check_at = self._next_check_time(time.time())
+        log(
+            "DEBUG",
+            "Next check at %s",
+            time.strftime("%H:%M", time.localtime(self._next_check_at)),
+        )
 
         # Let the rotary debounce settle before acting on the initial state.
         # Without this, the default position (1) is used and immediately
         # switched away once the real knob position is detected.
         self._wait_for_rotary()
 
-        last_state, last_podcast = self.hardware.read_state()
-        self.handle_switch_change(last_state, last_podcast)
+        # poll_change() marks the state as reported, so the loop won't
+        # dispatch it again; if something already consumed that report it
+        # returns None, and the current state is read directly instead
+        initial = self.hardware.poll_change() or self.hardware.read_state()
+        self.handle_switch_change(*initial)
 
         log("INFO", "Ready. Ctrl+C to quit.\n")
 
         try:
             while True:
-                schedule.run_pending()
+                now = time.time()
+                if now >= self._next_check_at:
+                    self._next_check_at = self._next_check_time(now)
+                    self.check_for_new_episodes()
+                self._poll_check()
 
                 # Track how long audio has been idle, for deferred RSS checks
                 if self.audio.is_playing():
@@ -762,7 +1006,8 @@ class PodcastPlayer:
 
                 # Check for end-of-media (both podcast and music modes)
                 if self.audio.has_ended():
-                    if self._is_music_mode():
+                    self._credit_listening()
+                    if self._music_mode:
                         self._on_track_ended()
                     elif self.current_mode == SwitchState.PLAYING:
                         self._on_episode_ended()
@@ -775,15 +1020,32 @@ class PodcastPlayer:
                 ):
                     self._update_display()
 
-                state, podcast = self.hardware.read_state()
-                if state != last_state or podcast != last_podcast:
-                    self.handle_switch_change(state, podcast)
-                    last_state, last_podcast = state, podcast
+                change = self.hardware.poll_change()
+                if change is not None:
+                    self.handle_switch_change(*change)
 
-                time.sleep(POLL_INTERVAL)
+                self.hardware.wait_for_change(self._loop_timeout())
         except KeyboardInterrupt:
             raise
 
+    def _loop_timeout(self) -> float:
+        """How long the main loop may sleep before its next pass.
+
+        Switch edges wake it early regardless. Short while a switch reading
+        is being debounced, about a second while media is loaded or a check
+        is running/deferred, otherwise until the next scheduled check.
+        """
+        if self.hardware.needs_polling():
+            return POLL_INTERVAL
+        if (
+            self.audio.is_active()
+            or self._check_thread is not None
+            or self._check_deferred
+        ):
+            return IDLE_POLL_INTERVAL
+        idle = self._next_check_at - time.time()
+        return min(max(idle, 0.0), MAX_IDLE_WAIT)
+
     def cleanup(self):
         """Clean up all resources."""
         log("INFO", "Cleaning up...")
@@ -792,5 +1054,6 @@ class PodcastPlayer:
         self.hardware.cleanup()
         self.led.cleanup()
         self.display.cleanup()
-        self.state.save()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.state.cleanup()
         log("INFO", "Cleanup complete")
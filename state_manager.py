@@ -1,101 +1,468 @@
 """Persistent state storage for playback positions and episode metadata."""
 
+import hashlib
 import json
+import mmap
+import os
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
 from utils import log
 
+try:
+    import orjson  # much faster than json for the state dump, if installed
+except ImportError:
+    orjson = None
+
+# Periodic position updates only reach the disk this often (seconds).
+# Pause, switches and shutdown pass flush=True to write immediately.
+# Each flush is one small journal record, so this can stay short: it bounds
+# how much listening a power cut loses.
+POSITION_FLUSH_INTERVAL = 5
+
+# Publication times remembered per podcast for adaptive feed checks
+FEED_PUB_HISTORY = 5
+
+# Position updates are appended to a journal next to state.json instead of
+# rewriting the whole file; past this size the next one writes a snapshot.
+JOURNAL_MAX_BYTES = 64 * 1024
+# Journal records are written in batches from the flusher thread, or at once
+# when this many bytes are waiting
+JOURNAL_BUFFER_BYTES = 4096
+
+# state.json files larger than this are parsed straight from an mmap
+# (orjson only) instead of being read into a bytes copy first
+MMAP_LOAD_MIN_BYTES = 64 * 1024
+
+
+def _new_state() -> dict:
+    """Top-level layout of state.json, also used to fill in missing keys."""
+    return {
+        "version": 2,
+        "podcasts": {},
+        "music": {},
+        "feed_cache": {},
+        "last_check": 0,
+    }
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
 
 class StateManager:
     """Manages persistent JSON state for podcast player."""
 
-    def __init__(self, state_file: str = "state.json"):
+    def __init__(self, state_file: str = "state.json", read_only: bool = False):
         self.state_file = Path(state_file)
+        # Inspection tools (status.py) load state next to a running player:
+        # they replay the journal but must never truncate or delete it
+        self.read_only = read_only
+        # Guards serialization against concurrent mutation (feeds are fetched
+        # from a thread pool, positions arrive from the AudioPlayer thread)
+        self._lock = threading.RLock()
+        # Journal of position updates made since the last full save. Each
+        # record has a sequence number; state.json stores the last one it
+        # includes as journal_seq, so stale records are never replayed.
+        self.journal_file = self.state_file.with_name(self.state_file.name + ".log")
+        self._tmp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+        self._dir_fd = None  # opened on the first durable save
+        self._file_exists = self.state_file.exists()
+        self._last_digest = None  # blake2b of the last bytes written
+        self._journal_fd = None
+        self._journal_buf = bytearray()  # records not yet written
+        self._journal_bytes = 0
+        self._seq = 0
         self.state = self._load()
         self._last_save = 0.0
+        self._last_position_flush = 0.0
+        # Set when a save was throttled; the flusher thread writes it out
+        # once the throttle window has passed
+        self.dirty = False
+        self._wake = threading.Event()
+        self._stopping = False
+        # A read-only instance never writes, so it gets no flusher thread
+        self._flusher = None
+        if not read_only:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="state-flush", daemon=True
+            )
+            self._flusher.start()
+        # podcast_id -> frozenset of episode GUIDs (in memory only; kept in
+        # step by set_episodes)
+        self._guid_index = {}
+        # Bumped on every change; get_statistics() is memoized against it
+        self._version = 0
+        self._stats = None
+        # (wall-clock second, ISO timestamp) reused for last_played
+        self._iso_cache = (0, "")
 
     def _load(self):
         """Load state from file or create default."""
         if self.state_file.exists():
             try:
-                with open(self.state_file) as f:
-                    state = json.load(f)
-                state.setdefault("podcasts", {})
-                state.setdefault("music", {})
-                state.setdefault("feed_cache", {})
-                state.setdefault("last_check", 0)
-                return state
+                state = self._read_state_file()
+                for key, default in _new_state().items():
+                    state.setdefault(key, default)
             except (json.JSONDecodeError, Exception) as e:
                 log("ERROR", f"Error loading state: {e}")
-        return {
-            "version": 2,
-            "podcasts": {},
-            "music": {},
-            "feed_cache": {},
-            "last_check": 0,
-        }
-
-    def save(self, force: bool = False):
-        """Save state to file (throttled unless forced)."""
+            else:
+                try:
+                    self._replay_journal(state)
+                except Exception as e:
+                    # A bad journal only costs the positions it holds; the
+                    # snapshot itself is still good
+                    log("ERROR", f"Error replaying state journal: {e}")
+                    self._seq = state.get("journal_seq", 0)
+                    self._journal_bytes = 0
+                    if not self.read_only:
+                        self.journal_file.unlink(missing_ok=True)
+                return state
+        # Journal records only make sense on top of the snapshot they follow
+        if not self.read_only:
+            self.journal_file.unlink(missing_ok=True)
+        return _new_state()
+
+    def _read_state_file(self) -> dict:
+        with open(self.state_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if orjson and size > MMAP_LOAD_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return _loads(f.read())
+
+    def _replay_journal(self, state: dict):
+        """Apply journal records newer than the snapshot to a loaded state."""
+        self._seq = state.get("journal_seq", 0)
+        try:
+            data = self.journal_file.read_bytes()
+        except FileNotFoundError:
+            return
+        replayed = 0
+        good = 0  # bytes up to the end of the last complete record
+        while good < len(data):
+            end = data.find(b"\n", good)
+            if end < 0:
+                break  # torn last record from a crash mid-write
+            try:
+                rec = _loads(data[good:end])
+            except ValueError:
+                break
+            good = end + 1
+            if rec["seq"] <= self._seq:
+                continue
+            self._seq = rec["seq"]
+            replayed += 1
+            if "podcast" in rec:
+                podcast = state["podcasts"].get(rec["podcast"])
+                if podcast and 0 <= rec["episode"] < len(podcast["episodes"]):
+                    ep = podcast["episodes"][rec["episode"]]
+                    ep["position"] = rec["position"]
+                    ep["last_played"] = rec["last_played"]
+            else:
+                ms = state["music"].get(rec["music"])
+                if ms:
+                    for key in ("current_track", "position", "last_played"):
+                        ms[key] = rec[key]
+        if good < len(data) and not self.read_only:
+            # Cut the torn tail so the next appended record starts on its
+            # own line instead of being glued onto the fragment. (For a
+            # reader it may just be a record the player is writing now.)
+            os.truncate(self.journal_file, good)
+            log(
+                "WARNING",
+                "Dropped %d torn byte(s) from state journal",
+                len(data) - good,
+            )
+        self._journal_bytes = good
+        if replayed:
+            log("DEBUG", "Replayed %d journal record(s)", replayed)
+
+    def _append_journal(self, record: dict):
+        """Queue one position record for the journal.
+
+        Records are buffered and written by the flusher thread (or here,
+        once JOURNAL_BUFFER_BYTES have piled up), so the playback thread
+        doesn't wait on the disk. Falls back to a full save when the journal
+        has grown past JOURNAL_MAX_BYTES.
+        """
+        with self._lock:
+            if self._journal_bytes >= JOURNAL_MAX_BYTES:
+                self.save(force=True)
+                return
+            self._seq += 1
+            record["seq"] = self._seq
+            if orjson:
+                line = orjson.dumps(record) + b"\n"
+            else:
+                line = json.dumps(record).encode() + b"\n"
+            self._journal_buf += line
+            self._journal_bytes += len(line)
+            if len(self._journal_buf) >= JOURNAL_BUFFER_BYTES:
+                self._write_journal()
+                return
+        self._wake.set()
+
+    def _write_journal(self):
+        """Append buffered journal records to the journal file."""
+        with self._lock:
+            if not self._journal_buf or self.read_only:
+                return
+            try:
+                if self._journal_fd is None:
+                    self._journal_fd = os.open(
+                        self.journal_file,
+                        os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                        0o644,
+                    )
+                os.write(self._journal_fd, self._journal_buf)
+                self._journal_buf.clear()
+            except OSError as e:
+                log("ERROR", f"Failed to append to state journal: {e}")
+                self.save(force=True)
+
+    def save(self, force: bool = False, durable: bool = False):
+        """Save state to file (throttled unless forced).
+
+        A throttled save isn't dropped: it marks the state dirty and the
+        flusher thread writes it, so bursts of changes cost one write.
+        The file is replaced atomically via a temp file; durable=True also
+        fsyncs it and its directory so it survives a power cut. Does
+        nothing on a read_only instance.
+        """
+        self._version += 1
+        if self.read_only:
+            return
         if not force and time.time() - self._last_save < 1.0:
+            self.mark_dirty()
             return
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(self.state, f, indent=2)
+            with self._lock:
+                self.dirty = False
+                self.state["journal_seq"] = self._seq
+                # Compact output: indentation roughly doubled the bytes
+                # written; use `python -m json.tool state.json` to read it
+                if orjson:
+                    data = orjson.dumps(self.state)
+                else:
+                    data = json.dumps(self.state, separators=(",", ":")).encode()
+                # Nothing changed since the last write: leave the file alone
+                # (a durable save still writes, to get it fsynced)
+                digest = hashlib.blake2b(data, digest_size=8).digest()
+                if digest == self._last_digest and not durable:
+                    return
+                self._write_file(data, durable)
+                self._last_digest = digest
+                # The snapshot covers every journal record: start it afresh.
+                # Truncated in place (not unlinked) so another process's
+                # append handle keeps writing to the same file.
+                self._journal_buf.clear()
+                if self._journal_bytes or self.journal_file.exists():
+                    os.truncate(self.journal_file, 0)
+                    self._journal_bytes = 0
             self._last_save = time.time()
         except Exception as e:
+            self.dirty = True
             log("ERROR", f"Failed to save state: {e}")
 
+    def _write_file(self, data: bytes, durable: bool):
+        """Write data as the new state.json.
+
+        Normally via a temp file and os.replace. While no state.json
+        exists yet there's nothing to protect, so it is created directly
+        with O_EXCL; if one appeared meanwhile, the temp path is used.
+        """
+        direct = False
+        if not self._file_exists:
+            try:
+                fd = os.open(
+                    self.state_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644
+                )
+                direct = True
+            except FileExistsError:
+                pass
+            self._file_exists = True
+        if not direct:
+            fd = os.open(self._tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if not direct:
+            os.replace(self._tmp_file, self.state_file)
+        if durable:
+            self._fsync_dir()
+
+    def _fsync_dir(self):
+        """fsync the state directory so the rename itself is on disk."""
+        if self._dir_fd is None:
+            self._dir_fd = os.open(
+                self.state_file.parent, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+            )
+        os.fsync(self._dir_fd)
+
+    def flush(self):
+        """Write out changes held back by the save throttle."""
+        if self.dirty:
+            self.save()
+
+    def mark_dirty(self):
+        """Record a change for the flusher thread instead of writing now.
+
+        Used at track/episode boundaries, where a completion is followed
+        right away by the next track's state: both land in one write.
+        """
+        self._version += 1
+        with self._lock:
+            self.dirty = True
+        self._wake.set()
+
+    def _flush_loop(self):
+        """Write dirty state off the caller's thread, at most once a second.
+
+        Sleeps on _wake while nothing is pending, so an idle player doesn't
+        wake up for it.
+        """
+        while True:
+            self._wake.wait()
+            if self._stopping:
+                return
+            self._wake.clear()
+            self._write_journal()
+            delay = self._last_save + 1.0 - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self.flush()
+
+    def _now_iso(self) -> str:
+        """Current time as ISO string, formatted at most once per second."""
+        second = int(time.time())
+        cached = self._iso_cache
+        if cached[0] != second:
+            cached = self._iso_cache = (second, datetime.now().isoformat())
+        return cached[1]
+
+    def _save_position(self, flush: bool) -> bool:
+        """Persist a position update, coalescing periodic ticks.
+
+        flush=True writes the full state. Otherwise returns True once every
+        POSITION_FLUSH_INTERVAL, when the caller should journal the tick
+        (the record is only built then).
+        """
+        self._version += 1
+        now = time.monotonic()
+        if flush:
+            self._last_position_flush = now
+            self.save(force=True)
+        elif now - self._last_position_flush >= POSITION_FLUSH_INTERVAL:
+            self._last_position_flush = now
+            return True
+        return False
+
     # --- Feed cache (conditional GET) ---
 
     def get_feed_cache(self, podcast_id: str) -> dict:
         """Get cached HTTP headers for a podcast feed."""
-        return self.state["feed_cache"].get(podcast_id, {})
+        with self._lock:
+            return dict(self.state["feed_cache"].get(podcast_id, {}))
 
     def save_feed_cache(self, podcast_id: str, cache: dict):
         """Save HTTP cache headers (ETag, Last-Modified) for a podcast feed."""
         # Only store non-None values
         cleaned = {k: v for k, v in cache.items() if v is not None}
-        if cleaned:
-            self.state["feed_cache"][podcast_id] = cleaned
-        elif podcast_id in self.state["feed_cache"]:
-            del self.state["feed_cache"][podcast_id]
-        self.save()
+        with self._lock:
+            if cleaned == self.state["feed_cache"].get(podcast_id, {}):
+                return  # same validators as last time, nothing to write
+            if cleaned:
+                self.state["feed_cache"][podcast_id] = cleaned
+            elif podcast_id in self.state["feed_cache"]:
+                del self.state["feed_cache"][podcast_id]
+            self.save()
 
     # --- Podcast state ---
 
     def get_podcast(self, podcast_id: str):
         """Get or create podcast state."""
-        if podcast_id not in self.state["podcasts"]:
-            self.state["podcasts"][podcast_id] = {
-                "episodes": [],
-                "current_index": 0,
-                "total_time": 0,
-            }
+        with self._lock:
+            if podcast_id not in self.state["podcasts"]:
+                self.state["podcasts"][podcast_id] = {
+                    "episodes": [],
+                    "current_index": 0,
+                    "total_time": 0,
+                }
+                self.mark_dirty()
+            return self.state["podcasts"][podcast_id]
+
+    def peek_podcast(self, podcast_id: str) -> dict:
+        """Podcast state if present, else an empty dict (never creates it)."""
+        return self.state["podcasts"].get(podcast_id, {})
+
+    def known_guids(self, podcast_id: str) -> frozenset:
+        """GUIDs of the episodes stored for a podcast."""
+        guids = self._guid_index.get(podcast_id)
+        if guids is None:
+            episodes = self.get_podcast(podcast_id)["episodes"]
+            guids = frozenset(ep["guid"] for ep in episodes)
+            self._guid_index[podcast_id] = guids
+        return guids
+
+    def set_episodes(self, podcast_id: str, episodes: list):
+        """Replace a podcast's episode list and save."""
+        with self._lock:
+            self.get_podcast(podcast_id)["episodes"] = episodes
+            self._guid_index[podcast_id] = frozenset(ep["guid"] for ep in episodes)
             self.save()
-        return self.state["podcasts"][podcast_id]
 
-    def update_position(self, podcast_id: str, episode_index: int, position: float):
-        """Update playback position for episode."""
+    def update_position(
+        self, podcast_id: str, episode_index: int, position: float, flush: bool = False
+    ):
+        """Update playback position for episode. Written to disk every
+        POSITION_FLUSH_INTERVAL seconds unless flush=True."""
         podcast = self.get_podcast(podcast_id)
-        if 0 <= episode_index < len(podcast["episodes"]):
-            podcast["episodes"][episode_index]["position"] = position
-            podcast["episodes"][episode_index][
-                "last_played"
-            ] = datetime.now().isoformat()
-            podcast["total_time"] = podcast.get("total_time", 0) + 1
-            self.save()
+        episodes = podcast["episodes"]
+        if 0 <= episode_index < len(episodes):
+            ep = episodes[episode_index]
+            ep["position"] = position
+            ep["last_played"] = last_played = self._now_iso()
+            if self._save_position(flush):
+                self._append_journal(
+                    {
+                        "podcast": podcast_id,
+                        "episode": episode_index,
+                        "position": position,
+                        "last_played": last_played,
+                    }
+                )
+
+    def add_listening_time(self, state_id: str, seconds: float):
+        """Add seconds of playback to a podcast's or album's total_time.
+
+        Credited by the player when playback pauses, switches or ends,
+        rather than counted per position tick.
+        """
+        with self._lock:
+            if state_id.startswith("music_"):
+                entry = self.state["music"].get(state_id)
+            else:
+                entry = self.state["podcasts"].get(state_id)
+            if entry is not None:
+                entry["total_time"] = round(entry.get("total_time", 0) + seconds, 1)
+                self.mark_dirty()
 
     def update_episode_duration(
         self, podcast_id: str, episode_index: int, duration: float
     ):
         """Store the duration (seconds) of a podcast episode once known."""
-        podcast = self.get_podcast(podcast_id)
-        if 0 <= episode_index < len(podcast["episodes"]):
-            podcast["episodes"][episode_index]["duration"] = duration
-            self.save()
+        with self._lock:
+            podcast = self.get_podcast(podcast_id)
+            if 0 <= episode_index < len(podcast["episodes"]):
+                podcast["episodes"][episode_index]["duration"] = duration
+                self.save()
 
     def get_episode_duration(self, podcast_id: str, episode_index: int) -> float:
         """Get stored duration for a podcast episode. Returns 0.0 if unknown."""
@@ -105,9 +472,34 @@ class StateManager:
         return 0.0
 
     def set_last_check(self, timestamp: float):
-        """Update last RSS check timestamp."""
+        """Update last RSS check timestamp (written by the flusher thread)."""
         self.state["last_check"] = timestamp
-        self.save(force=True)
+        self.mark_dirty()
+
+    def add_pub_times(self, podcast_id: str, times: list) -> list:
+        """Merge episode publication timestamps into the podcast's history.
+
+        Keeps the newest FEED_PUB_HISTORY, sorted. Returns the history.
+        """
+        with self._lock:
+            podcast = self.get_podcast(podcast_id)
+            history = podcast.get("pub_times", [])
+            merged = sorted(set(history).union(times))[-FEED_PUB_HISTORY:]
+            if merged != history:
+                podcast["pub_times"] = merged
+                self.save()
+            return merged
+
+    def get_next_feed_check(self, podcast_id: str) -> float:
+        """Earliest time this podcast's feed should be fetched again (0 = now)."""
+        return self.get_podcast(podcast_id).get("next_check_at", 0)
+
+    def set_next_feed_check(self, podcast_id: str, timestamp: float):
+        with self._lock:
+            podcast = self.get_podcast(podcast_id)
+            if podcast.get("next_check_at", 0) != timestamp:
+                podcast["next_check_at"] = timestamp
+                self.save()
 
     def get_last_check(self) -> float:
         return self.state.get("last_check", 0)
@@ -115,12 +507,14 @@ class StateManager:
     def mark_episode_completed(self, podcast_id: str, episode_index: int):
         """Mark episode complete and advance to next."""
         podcast = self.get_podcast(podcast_id)
-        if 0 <= episode_index < len(podcast["episodes"]):
-            podcast["episodes"][episode_index]["completed"] = True
-            podcast["episodes"][episode_index]["ever_completed"] = True
-            if episode_index + 1 < len(podcast["episodes"]):
+        episodes = podcast["episodes"]
+        if 0 <= episode_index < len(episodes):
+            ep = episodes[episode_index]
+            ep["completed"] = True
+            ep["ever_completed"] = True
+            if episode_index + 1 < len(episodes):
                 podcast["current_index"] = episode_index + 1
-            self.save(force=True)
+            self.mark_dirty()
 
     # --- Music state ---
 
@@ -157,26 +551,37 @@ class StateManager:
             "ever_completed": ever_completed,
             "total_time": total_time,
             "current_track_duration": track_duration,
-            "last_played": datetime.now().isoformat(),
+            "last_played": self._now_iso(),
         }
-        self.save()
+        self.mark_dirty()
 
-    def update_music_position(self, music_id: str, track_index: int, position: float):
-        """Update playback position for current music track."""
+    def update_music_position(
+        self, music_id: str, track_index: int, position: float, flush: bool = False
+    ):
+        """Update playback position for current music track. Written to disk
+        every POSITION_FLUSH_INTERVAL seconds unless flush=True."""
         ms = self.state["music"].get(music_id)
         if ms:
             ms["current_track"] = track_index
             ms["position"] = position
-            ms["total_time"] = ms.get("total_time", 0) + 1
-            ms["last_played"] = datetime.now().isoformat()
-            self.save()
+            ms["last_played"] = last_played = self._now_iso()
+            if self._save_position(flush):
+                self._append_journal(
+                    {
+                        "music": music_id,
+                        "current_track": track_index,
+                        "position": position,
+                        "last_played": last_played,
+                    }
+                )
 
     def update_music_track_duration(self, music_id: str, duration: float):
         """Store the duration of the current music track once known."""
-        ms = self.state["music"].get(music_id)
-        if ms:
-            ms["current_track_duration"] = duration
-            self.save()
+        with self._lock:
+            ms = self.state["music"].get(music_id)
+            if ms:
+                ms["current_track_duration"] = duration
+                self.save()
 
     def get_music_track_duration(self, music_id: str) -> float:
         """Get stored duration for current music track. Returns 0.0 if unknown."""
@@ -193,7 +598,7 @@ class StateManager:
             ms["ever_completed"] = True
             ms["position"] = 0.0
             ms["current_track"] = 0
-            self.save(force=True)
+            self.mark_dirty()
 
     def reset_music(self, music_id: str):
         """Reset album state for replay. Preserves ever_completed and total_time."""
@@ -205,19 +610,26 @@ class StateManager:
             ms["tracks"] = []
             ms["current_track_duration"] = 0.0
             # folder, ever_completed, total_time, last_played preserved
-            self.save(force=True)
+            self.mark_dirty()
 
     # --- Statistics ---
 
     def get_statistics(self):
-        """Get listening statistics."""
-        total_eps = sum(len(p["episodes"]) for p in self.state["podcasts"].values())
-        total_podcast_time = sum(
-            p.get("total_time", 0) for p in self.state["podcasts"].values()
-        )
-        total_music_time = sum(
-            m.get("total_time", 0) for m in self.state["music"].values()
-        )
+        """Get listening statistics.
+
+        Memoized on _version, which every save/mark_dirty/position update
+        bumps, so repeated calls without a change in between are free.
+        """
+        if self._stats is not None and self._stats[0] == self._version:
+            return dict(self._stats[1])
+
+        total_eps = total_podcast_time = 0
+        for p in self.state["podcasts"].values():
+            total_eps += len(p["episodes"])
+            total_podcast_time += p.get("total_time", 0)
+        total_music_time = 0
+        for m in self.state["music"].values():
+            total_music_time += m.get("total_time", 0)
         total_time = total_podcast_time + total_music_time
 
         last_check = self.state.get("last_check", 0)
@@ -228,7 +640,7 @@ class StateManager:
         else:
             last_check_str = "Never"
 
-        return {
+        stats = {
             "total_podcasts": len(self.state["podcasts"]),
             "total_episodes": total_eps,
             "total_albums": len(self.state["music"]),
@@ -237,6 +649,18 @@ class StateManager:
             "total_music_time_hours": total_music_time / 3600,
             "last_check": last_check_str,
         }
+        self._stats = (self._version, stats)
+        return dict(stats)
 
     def cleanup(self):
-        self.save(force=True)
+        self._stopping = True
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=2)
+        self.save(force=True, durable=True)
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
+        if self._dir_fd is not None:
+            os.close(self._dir_fd)
+            self._dir_fd = None
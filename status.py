@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Status display tool for podcast player."""
 
+import os
 import sys
 from pathlib import Path
 
@@ -12,68 +13,75 @@ from utils import format_duration, format_file_size
 
 
 def main():
-    print("=" * 60)
-    print("📊 Podcast Player Status")
-    print("=" * 60)
+    # Collected and written in one go at the end rather than line by line
+    out = []
+
+    out.append("=" * 60)
+    out.append("📊 Podcast Player Status")
+    out.append("=" * 60)
 
     try:
         config = Config()
-        state = StateManager()
+        # Read-only: the player may be running and writing the journal
+        state = StateManager(read_only=True)
         manager = PodcastManager(config)
         music = MusicManager()
 
         # Config
-        print(
+        out.append(
             f"\n📋 Config: {config.episodes_dir}, max {config.max_episodes}/podcast, check every {config.check_interval_hours}h"
         )
 
         # Podcasts
-        print(f"\n📻 Podcasts ({len(config.podcasts)}):")
+        out.append(f"\n📻 Podcasts ({len(config.podcasts)}):")
         for i, p in enumerate(config.podcasts, 1):
-            print(f"   {i}. {p['name']}")
+            out.append(f"   {i}. {p['name']}")
 
         # Stats
         stats = state.get_statistics()
-        print(
+        out.append(
             f"\n📈 Stats: {stats['total_episodes']} episodes, "
             f"{stats['total_podcast_time_hours']:.1f}h podcast / "
             f"{stats['total_music_time_hours']:.1f}h music, "
             f"last check: {stats['last_check']}"
         )
 
+        # One walk of episodes_dir serves the episode sizes and the storage line
+        scan = manager.scan_episode_files()
+
         # Podcast Episodes
-        print("\n📚 Podcast Episodes:")
+        out.append("\n📚 Podcast Episodes:")
         for i, pc in enumerate(config.podcasts):
             podcast_id = f"podcast_{i + 1}"
-            ps = state.get_podcast(podcast_id)
-            print(f"\n   {pc['name']}:")
+            ps = state.peek_podcast(podcast_id)
+            out.append(f"\n   {pc['name']}:")
 
-            if not ps["episodes"]:
-                print("      (none)")
+            if not ps.get("episodes"):
+                out.append("      (none)")
                 continue
 
             curr = ps.get("current_index", 0)
+            sizes = scan.get(podcast_id, {})
             for j, ep in enumerate(ps["episodes"]):
                 marker = "▶️" if j == curr else ("✅" if ep.get("completed") else "  ")
-                path = manager.get_episode_path(podcast_id, ep["file"])
                 size = (
-                    format_file_size(path.stat().st_size)
-                    if path.exists()
+                    format_file_size(sizes[ep["file"]])
+                    if ep["file"] in sizes
                     else "missing"
                 )
-                print(
+                out.append(
                     f"      {marker} {j+1}. {ep['title'][:40]} | {format_duration(ep.get('position', 0))} | {size}"
                 )
 
         # Music Albums
         albums = music.get_all_albums_info()
         album_source = "configured" if config.albums else "auto-discovered"
-        print(
+        out.append(
             f"\n🎵 Music Albums ({len(albums)} {album_source}, base: {config.music_dir}):"
         )
 
         if not albums:
-            print("   (none)")
+            out.append("   (none)")
         else:
             for album in albums:
                 pos = album["position"]
@@ -82,15 +90,15 @@ def main():
                 ms = state.get_music(music_id)
 
                 if not album["exists"]:
-                    print(f"   {pos:2}. {name} [MISSING]")
+                    out.append(f"   {pos:2}. {name} [MISSING]")
                     continue
 
                 if not ms:
-                    print(f"   {pos:2}. {name} (not started)")
+                    out.append(f"   {pos:2}. {name} (not started)")
                     continue
 
                 if ms.get("completed"):
-                    print(f"   {pos:2}. {name} ✅ Completed")
+                    out.append(f"   {pos:2}. {name} ✅ Completed")
                     continue
 
                 tracks = ms.get("tracks", [])
@@ -99,34 +107,38 @@ def main():
                 total = len(tracks)
                 current_file = tracks[track_idx] if track_idx < total else "?"
 
-                print(f"   {pos:2}. {name}")
-                print(
+                out.append(f"   {pos:2}. {name}")
+                out.append(
                     f"       ▶️ Track {track_idx + 1}/{total} | {format_duration(position)} | {current_file}"
                 )
 
         # Storage
-        info = manager.get_storage_info()
-        print(
+        info = manager.get_storage_info(scan)
+        out.append(
             f"\n💾 Storage: {info['episode_count']} files, {info['total_size_mb']:.1f} MB in {info['episodes_dir']}"
         )
 
         # Disk space
         try:
-            import shutil
-
-            st = shutil.disk_usage(config.episodes_dir)
-            print(
-                f"💿 Disk: {st.free / 1e9:.1f} GB free / {st.total / 1e9:.1f} GB ({st.used / st.total * 100:.0f}% used)"
+            st = os.statvfs(config.episodes_dir)
+            total = st.f_blocks * st.f_frsize
+            free = st.f_bavail * st.f_frsize
+            used = (st.f_blocks - st.f_bfree) * st.f_frsize
+            out.append(
+                f"💿 Disk: {free / 1e9:.1f} GB free / {total / 1e9:.1f} GB ({used / total * 100:.0f}% used)"
             )
-        except:
+        except (OSError, ZeroDivisionError):
             pass
 
-        print("\n✅ Done")
+        out.append("\n✅ Done")
 
     except FileNotFoundError as e:
-        print(f"\n❌ {e}")
+        out.append(f"\n❌ {e}")
         sys.exit(1)
 
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,9 @@
 """Utility functions and helpers."""
 
+import os
 import sys
-from datetime import datetime
+import time
+from functools import lru_cache
 from typing import Callable
 
 # Global LED controller reference (set by PodcastPlayer)
@@ -10,6 +12,23 @@ _led_controller = None
 # Cache debug mode (loaded once)
 _debug_mode = None
 
+# (wall-clock second, "HH:MM:SS") of the last log line
+_last_stamp = (0, "")
+
+# Whether stdout is a terminal can't change while running: check it once
+_IS_TTY = sys.stdout.isatty()
+
+# Level name padded and, on a terminal, wrapped in its color
+_LEVEL_LABELS = {
+    level: f"{color}{level:8}\033[0m" if _IS_TTY else f"{level:8}"
+    for level, color in (
+        ("DEBUG", "\033[36m"),
+        ("INFO", "\033[32m"),
+        ("WARNING", "\033[33m"),
+        ("ERROR", "\033[31m"),
+    )
+}
+
 
 def _get_debug_mode():
     """Get debug mode, cached after first call."""
@@ -20,7 +39,7 @@ def _get_debug_mode():
 
             with open("config.json", "r") as f:
                 _debug_mode = json.load(f).get("debug_mode", False)
-        except:
+        except (OSError, ValueError):
             _debug_mode = False
     return _debug_mode
 
@@ -31,26 +50,33 @@ def set_led_controller(controller):
     _led_controller = controller
 
 
-def log(level: str, message: str):
-    """Log message with timestamp. Levels: DEBUG, INFO, WARNING, ERROR."""
+def log(level: str, message: str, *args):
+    """Log message with timestamp. Levels: DEBUG, INFO, WARNING, ERROR.
+
+    Extra args are %-formatted into message only when the line is actually
+    emitted, so disabled DEBUG calls cost a single check.
+    """
     if level == "DEBUG" and not _get_debug_mode():
         return
-
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    colors = {
-        "DEBUG": "\033[36m",
-        "INFO": "\033[32m",
-        "WARNING": "\033[33m",
-        "ERROR": "\033[31m",
-    }
-    reset = "\033[0m"
-
-    if sys.stdout.isatty():
-        out = f"[{timestamp}] {colors.get(level, '')}{level:8}{reset} {message}"
-    else:
-        out = f"[{timestamp}] {level:8} {message}"
-
-    print(out, file=sys.stderr if level in ("WARNING", "ERROR") else sys.stdout)
+    if args:
+        message = message % args
+
+    global _last_stamp
+    now = int(time.time())
+    if _last_stamp[0] != now:
+        _last_stamp = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    timestamp = _last_stamp[1]
+    label = _LEVEL_LABELS.get(level) or f"{level:8}"
+    out = f"[{timestamp}] {label} {message}"
+
+    # One os.write per line instead of print()'s write/flush sequence.
+    # Flushing first keeps the line in order with anything print()ed.
+    stream = sys.stderr if level in ("WARNING", "ERROR") else sys.stdout
+    try:
+        stream.flush()
+        os.write(stream.fileno(), (out + "\n").encode())
+    except (AttributeError, OSError, ValueError):
+        print(out, file=stream)  # stream without a real file descriptor
 
     # Trigger LED on warning/error
     if _led_controller and level in ("WARNING", "ERROR"):
@@ -72,9 +98,17 @@ def safe_cleanup(cleanup_func: Callable) -> bool:
 
 def format_duration(seconds: float) -> str:
     """Format seconds as '1h 23m 45s'."""
-    if seconds < 0:
-        return "0s"
-    h, rem = divmod(int(seconds), 3600)
+    return _format_whole_seconds(int(seconds) if seconds >= 0 else -1)
+
+
+@lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds: int) -> str:
+    if seconds < 60:
+        return f"{max(seconds, 0)}s"
+    if seconds < 3600:
+        m, s = divmod(seconds, 60)
+        return f"{m}m {s}s" if s else f"{m}m"
+    h, rem = divmod(seconds, 3600)
     m, s = divmod(rem, 60)
     parts = []
     if h:
@@ -86,10 +120,11 @@ def format_duration(seconds: float) -> str:
     return " ".join(parts)
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_file_size(bytes_size: float) -> str:
     """Format bytes as '12.3 MB'."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if bytes_size < 1024:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024
-    return f"{bytes_size:.1f} TB"
+    # The unit is the number of whole 10-bit steps in the size
+    exp = min((int(bytes_size).bit_length() - 1) // 10, 4) if bytes_size >= 1 else 0
+    return f"{bytes_size / (1 << (exp * 10)):.1f} {_SIZE_UNITS[exp]}"